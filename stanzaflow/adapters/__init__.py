@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from functools import cache
+
 from .base import Adapter
 from .langgraph.adapter import LangGraphAdapter
 
@@ -11,9 +13,12 @@ _ADAPTERS: dict[str, type[Adapter]] = {
 }
 
 
+@cache
 def get_adapter(name: str) -> Adapter:
     """Get an adapter instance by name.
 
+    Adapters are stateless, so one shared instance is returned per name.
+
     Args:
         name: Name of the adapter
 
@@ -25,7 +25,6 @@ class LangGraphEmitter:
 
         workflow = ir.get("workflow", {})
         title = workflow.get("title", "Untitled Workflow")
-        workflow.get("agents", [])
 
         # Generate the LangGraph code
         code_lines = self._generate_code(ir)
@@ -42,8 +41,8 @@ class LangGraphEmitter:
         # Ensure parent directory exists
         file_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(code_lines))
+        # Join once at the boundary; _generate_code only ever appends to a list
+        file_path.write_text("\n".join(code_lines), encoding="utf-8")
 
     def _generate_code(self, ir: dict[str, Any]) -> list[str]:
         """Generate LangGraph code from IR."""
@@ -2,6 +2,7 @@
 
 import sys
 from pathlib import Path
+from typing import Any
 
 import typer
 from rich.traceback import install
@@ -52,6 +53,22 @@ def _assert_safe_output(path: Path, force: bool) -> None:
         raise typer.Exit(1)
 
 
+def _assert_secrets_available(ir: dict[str, Any]) -> None:
+    """Exit with a configuration error if any secret in *ir* is unset."""
+    from stanzaflow.core.secrets import validate_secrets
+
+    missing_secrets = validate_secrets(ir)
+    if missing_secrets:
+        console.print("[red]Error: Missing required environment variables:[/red]")
+        for secret in missing_secrets:
+            console.print(f"  ❌ {secret}")
+        console.print("\n[yellow]Solution:[/yellow]")
+        console.print("  Set the missing environment variables before compiling:")
+        for secret in missing_secrets:
+            console.print(f"    export {secret}=your_value_here")
+        raise typer.Exit(2)
+
+
 @app.command()
 def graph(
     file: Path = typer.Argument(..., help="Path to .sf.md file"),
@@ -71,13 +88,12 @@ def graph(
         raise typer.Exit(1)
 
     try:
-        from stanzaflow.core.ast import StanzaFlowCompiler
+        from stanzaflow.core.ir_cache import get_or_build_ir
         from stanzaflow.tools.graph import generate_workflow_graph
 
         # Parse workflow to get IR
-        compiler = StanzaFlowCompiler()
         console.print("📊 Parsing workflow...")
-        ir = compiler.compile_file(file)
+        ir = get_or_build_ir(file)
 
         # Determine output path
         user_specified = output is not None
@@ -131,30 +147,16 @@ def compile(
         raise typer.Exit(1)
 
     try:
-        from stanzaflow.core.ast import StanzaFlowCompiler
-
-        # Create compiler
-        compiler = StanzaFlowCompiler()
+        from stanzaflow.core.ir_cache import get_or_build_ir
 
         # Parse workflow and generate IR
         console.print("📝 Parsing workflow...")
-        ir = compiler.compile_file(file)
+        ir = get_or_build_ir(file)
         workflow_title = ir.get("workflow", {}).get("title", "Untitled Workflow")
         console.print(f"✅ Parsed: {workflow_title}")
 
         # Validate secrets
-        from stanzaflow.core.secrets import validate_secrets
-
-        missing_secrets = validate_secrets(ir)
-        if missing_secrets:
-            console.print("[red]Error: Missing required environment variables:[/red]")
-            for secret in missing_secrets:
-                console.print(f"  ❌ {secret}")
-            console.print("\n[yellow]Solution:[/yellow]")
-            console.print("  Set the missing environment variables before compiling:")
-            for secret in missing_secrets:
-                console.print(f"    export {secret}=your_value_here")
-            raise typer.Exit(2)
+        _assert_secrets_available(ir)
 
         # Determine output path
         user_specified = output is not None
@@ -238,13 +240,12 @@ def audit(
         raise typer.Exit(1)
 
     try:
-        from stanzaflow.core.ast import StanzaFlowCompiler
+        from stanzaflow.core.ir_cache import get_or_build_ir
         from stanzaflow.tools.audit import audit_workflow
 
         # Parse workflow to get IR
-        compiler = StanzaFlowCompiler()
         console.print("🔍 Parsing workflow...")
-        ir = compiler.compile_file(file)
+        ir = get_or_build_ir(file)
 
         # Run audit
         console.print(f"🔎 Auditing against {target} adapter...")
@@ -0,0 +1,34 @@
+"""JSON helpers that use orjson when it is installed."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    _HAS_ORJSON = False
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize *obj* to compact UTF-8 JSON with sorted keys.
+
+    Raises:
+        TypeError: If *obj* is not serializable; with orjson this includes
+            integers outside the 64-bit range.
+    """
+    if _HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(
+        obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Deserialize JSON from *data*."""
+    if _HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import ast
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import Any
 
@@ -33,19 +36,34 @@ def process_ai_escapes(ir: dict[str, Any], model: str = "gpt-4") -> dict[str, An
     workflow = ir.get("workflow", {})
     escape_blocks = workflow.get("escape_blocks", [])
 
-    if escape_blocks:
-        # In the future, this would:
-        # 1. Analyze the escape blocks
-        # 2. Use LiteLLM to generate appropriate code
-        # 3. Validate the generated code in a sandbox
-        # 4. Cache the results
-
-        # For now, just add a comment to the escape blocks
-        for escape_block in escape_blocks:
-            original_code = escape_block.get("code", "")
-            escape_block[
-                "code"
-            ] = f"""# AI-generated code (stub)
+    if len(escape_blocks) > 1:
+        # Blocks are independent LLM requests, so process them concurrently
+        with ThreadPoolExecutor(max_workers=min(8, len(escape_blocks))) as executor:
+            generated = list(
+                executor.map(_process_escape_block, escape_blocks, repeat(model))
+            )
+    else:
+        generated = [_process_escape_block(block, model) for block in escape_blocks]
+
+    for escape_block, code in zip(escape_blocks, generated, strict=True):
+        escape_block["code"] = code
+
+    return ir
+
+
+def _process_escape_block(escape_block: dict[str, Any], model: str) -> str:
+    """Generate replacement code for a single escape block.
+
+    In the future, this would:
+    1. Analyze the escape block
+    2. Use LiteLLM to generate appropriate code
+    3. Validate the generated code in a sandbox
+    4. Cache the results
+
+    For now, it just wraps the original code in a stub comment.
+    """
+    original_code = escape_block.get("code", "")
+    return f"""# AI-generated code (stub)
 # Model: {model}
 # Original request: {escape_block.get('target', 'unknown')}
 
@@ -54,8 +72,6 @@ def process_ai_escapes(ir: dict[str, Any], model: str = "gpt-4") -> dict[str, An
 # TODO: Replace with actual AI-generated implementation
 """
 
-    return ir
-
 
 def cache_escape_result(escape_hash: str, generated_code: str) -> None:
     """Cache an AI escape result for future use.
@@ -93,6 +109,76 @@ def get_cached_escape(escape_hash: str) -> str | None:
     return None
 
 
+# Modules generated code must never import
+_DANGEROUS_MODULES = frozenset(
+    {"os", "subprocess", "sys", "importlib", "__builtin__", "builtins"}
+)
+# Modules that are additionally flagged when imported under an alias
+_ALIASED_DANGEROUS_MODULES = frozenset({"os", "subprocess", "sys", "importlib"})
+_DANGEROUS_FUNCTIONS = frozenset({"exec", "eval", "compile", "__import__", "open"})
+_DANGEROUS_METHODS = frozenset(
+    {"system", "popen", "spawn", "fork", "execv", "execve", "spawnv"}
+)
+
+
+class _SecurityVisitor(ast.NodeVisitor):
+    """Collect dangerous operations found while walking generated code."""
+
+    def __init__(self) -> None:
+        self.findings: list[str] = []
+        # Recorded during the same walk so target checks need no second pass
+        self.imports_langgraph = False
+
+    def visit_Import(self, node: ast.Import) -> None:
+        # Check for dangerous imports
+        for alias in node.names:
+            if alias.name.startswith("langgraph"):
+                self.imports_langgraph = True
+            if alias.name in _DANGEROUS_MODULES:
+                self.findings.append(f"Dangerous import: {alias.name}")
+            # Check for aliased dangerous imports
+            if alias.asname and alias.name in _ALIASED_DANGEROUS_MODULES:
+                self.findings.append(
+                    f"Dangerous aliased import: {alias.name} as {alias.asname}"
+                )
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module and node.module.startswith("langgraph"):
+            self.imports_langgraph = True
+        # Check for dangerous from imports
+        if node.module in _DANGEROUS_MODULES:
+            self.findings.append(f"Dangerous import from: {node.module}")
+
+    def visit_Call(self, node: ast.Call) -> None:
+        # Check for dangerous function calls by name
+        if isinstance(node.func, ast.Name):
+            if node.func.id in _DANGEROUS_FUNCTIONS:
+                self.findings.append(f"Dangerous function call: {node.func.id}")
+        # Check for dangerous method calls
+        elif isinstance(node.func, ast.Attribute):
+            if node.func.attr in _DANGEROUS_METHODS:
+                self.findings.append(f"Dangerous method call: {node.func.attr}")
+                # Check for calls on single-letter variables (common alias pattern)
+                if (
+                    isinstance(node.func.value, ast.Name)
+                    and len(node.func.value.id) == 1
+                ):
+                    self.findings.append(
+                        f"Suspicious aliased call: {node.func.value.id}.{node.func.attr}"
+                    )
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        # Check for dangerous attribute access
+        if (
+            isinstance(node.attr, str)
+            and node.attr.startswith("__")
+            and node.attr.endswith("__")
+        ):
+            self.findings.append(f"Dangerous dunder access: {node.attr}")
+        self.generic_visit(node)
+
+
 def validate_generated_code(code: str, target: str) -> bool:
     """Validate generated code in a sandbox environment.
 
@@ -106,7 +192,6 @@ def validate_generated_code(code: str, target: str) -> bool:
     Raises:
         AIEscapeError: If validation fails
     """
-    import ast
     import time
 
     # Basic syntax checking
@@ -115,88 +200,11 @@ def validate_generated_code(code: str, target: str) -> bool:
     except SyntaxError as e:
         raise AIEscapeError(f"Generated code has syntax errors: {e}") from e
 
-    # Security checks - scan AST for dangerous operations
-    dangerous_nodes = []
-
-    class SecurityVisitor(ast.NodeVisitor):
-        def visit_Import(self, node: ast.Import) -> None:
-            # Check for dangerous imports
-            for alias in node.names:
-                if alias.name in {
-                    "os",
-                    "subprocess",
-                    "sys",
-                    "importlib",
-                    "__builtin__",
-                    "builtins",
-                }:
-                    dangerous_nodes.append(f"Dangerous import: {alias.name}")
-                # Check for aliased dangerous imports
-                if alias.asname and alias.name in {
-                    "os",
-                    "subprocess",
-                    "sys",
-                    "importlib",
-                }:
-                    dangerous_nodes.append(
-                        f"Dangerous aliased import: {alias.name} as {alias.asname}"
-                    )
-
-        def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
-            # Check for dangerous from imports
-            if node.module in {
-                "os",
-                "subprocess",
-                "sys",
-                "importlib",
-                "__builtin__",
-                "builtins",
-            }:
-                dangerous_nodes.append(f"Dangerous import from: {node.module}")
-
-        def visit_Call(self, node: ast.Call) -> None:
-            # Check for dangerous function calls by name
-            if isinstance(node.func, ast.Name):
-                if node.func.id in {"exec", "eval", "compile", "__import__", "open"}:
-                    dangerous_nodes.append(f"Dangerous function call: {node.func.id}")
-            # Check for dangerous method calls
-            elif isinstance(node.func, ast.Attribute):
-                dangerous_methods = {
-                    "system",
-                    "popen",
-                    "spawn",
-                    "fork",
-                    "execv",
-                    "execve",
-                    "spawnv",
-                }
-                if node.func.attr in dangerous_methods:
-                    dangerous_nodes.append(f"Dangerous method call: {node.func.attr}")
-                # Check for calls on single-letter variables (common alias pattern)
-                if (
-                    isinstance(node.func.value, ast.Name)
-                    and len(node.func.value.id) == 1
-                ):
-                    if node.func.attr in dangerous_methods:
-                        dangerous_nodes.append(
-                            f"Suspicious aliased call: {node.func.value.id}.{node.func.attr}"
-                        )
-            self.generic_visit(node)
-
-        def visit_Attribute(self, node: ast.Attribute) -> None:
-            # Check for dangerous attribute access
-            if (
-                isinstance(node.attr, str)
-                and node.attr.startswith("__")
-                and node.attr.endswith("__")
-            ):
-                dangerous_nodes.append(f"Dangerous dunder access: {node.attr}")
-            self.generic_visit(node)
-
     # Run security scan with timeout
     start_time = time.time()
-    visitor = SecurityVisitor()
+    visitor = _SecurityVisitor()
     visitor.visit(tree)
+    dangerous_nodes = visitor.findings
 
     # Check for timeout (basic protection)
     if time.time() - start_time > 5.0:  # 5 second limit for AST analysis
@@ -208,29 +216,8 @@ def validate_generated_code(code: str, target: str) -> bool:
         )
 
     # Additional target-specific validation
-    if target == "langgraph":
-        # Check for required LangGraph patterns
-        has_langgraph_imports = False
-        for node in ast.walk(tree):
-            if (
-                isinstance(node, ast.ImportFrom)
-                and node.module
-                and node.module.startswith("langgraph")
-            ):
-                has_langgraph_imports = True
-                break
-            elif isinstance(node, ast.Import):
-                for alias in node.names:
-                    if alias.name.startswith("langgraph"):
-                        has_langgraph_imports = True
-                        break
-                if has_langgraph_imports:
-                    break
-
-        if not has_langgraph_imports:
-            raise AIEscapeError(
-                "Generated LangGraph code must import langgraph modules"
-            )
+    if target == "langgraph" and not visitor.imports_langgraph:
+        raise AIEscapeError("Generated LangGraph code must import langgraph modules")
 
     return True
 
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import re
+import sys
+from collections.abc import Callable
 from dataclasses import dataclass, field
+from functools import cache
 from pathlib import Path
 from typing import Any
 
@@ -21,6 +25,25 @@ from stanzaflow.core.ir import validate_ir  # local import to avoid cycle
 # Type alias for Lark tree children
 TreeChild = Token | Tree[Token]
 
+# Unified attribute syntax: key: value (allows whitespace around colon)
+_ATTR_LINE_RE = re.compile(r"^(?P<key>[a-zA-Z_]+)\s*:\s*(?P<val>.+)$")
+
+
+def _parse_int(raw: str) -> int | None:
+    """Coerce a non-negative integer attribute, or None if malformed."""
+    return int(raw) if raw.isdigit() else None
+
+
+# Value coercion per supported attribute key; unknown keys are ignored
+_ATTR_COERCE: dict[str, Callable[[str], Any]] = {
+    "artifact": str,
+    "retry": _parse_int,
+    "timeout": _parse_int,
+    "on_error": str,
+    "branch": str,
+    "finally": str,
+}
+
 
 @dataclass
 class StepAttribute:
@@ -35,11 +58,12 @@ class Step:
     """Represents a workflow step."""
 
     name: str
-    attributes: list[StepAttribute] = field(default_factory=list)
+    # Keyed by interned attribute name; a repeated key keeps its last value
+    attributes: dict[str, StepAttribute] = field(default_factory=dict)
 
     def get_attribute(self, key: str) -> StepAttribute | None:
         """Get attribute by key."""
-        return next((attr for attr in self.attributes if attr.key == key), None)
+        return self.attributes.get(key)
 
 
 @dataclass
@@ -174,15 +198,15 @@ class StanzaFlowTransformer:
 
         return step
 
-    def _transform_step_body(self, tree: Tree[Token]) -> list[StepAttribute]:
-        """Transform step body to list of attributes."""
-        attributes = []
+    def _transform_step_body(self, tree: Tree[Token]) -> dict[str, StepAttribute]:
+        """Transform step body to attributes keyed by name."""
+        attributes: dict[str, StepAttribute] = {}
 
         for child in tree.children:
             if isinstance(child, Tree) and child.data == "step_attr":
                 attr = self._transform_step_attribute(child)
                 if attr:
-                    attributes.append(attr)
+                    attributes[attr.key] = attr
 
         return attributes
 
@@ -191,27 +215,17 @@ class StanzaFlowTransformer:
         # Structure: one of the ATTR_* tokens
         for child in tree.children:
             if isinstance(child, Token):
-                line = child.value.strip()
-
-                # Unified regex parsing: key: value (allows whitespace around colon)
-                import re
-
-                match = re.match(r"^(?P<key>[a-zA-Z_]+)\s*:\s*(?P<val>.+)$", line)
+                match = _ATTR_LINE_RE.match(child.value.strip())
                 if not match:
                     continue
-                key = match.group("key").lower()
-                raw_val = match.group("val").strip()
-
-                if key == "artifact":
-                    return StepAttribute(key="artifact", value=raw_val)
-                if key == "retry":
-                    if raw_val.isdigit():
-                        return StepAttribute(key="retry", value=int(raw_val))
-                if key == "timeout":
-                    if raw_val.isdigit():
-                        return StepAttribute(key="timeout", value=int(raw_val))
-                if key in {"on_error", "branch", "finally"}:
-                    return StepAttribute(key=key, value=raw_val)
+                # Intern keys so repeated attribute names share one string object
+                key = sys.intern(match.group("key").lower())
+                coerce = _ATTR_COERCE.get(key)
+                if coerce is None:
+                    continue
+                value = coerce(match.group("val").strip())
+                if value is not None:
+                    return StepAttribute(key=key, value=value)
 
         return None
 
@@ -244,22 +258,32 @@ class StanzaFlowTransformer:
         return SecretBlock(env_var=env_var)
 
 
+@cache
+def _get_parser() -> Lark:
+    """Build the Lark parser once per process.
+
+    Grammar analysis dominates compiler construction, and a Lark parser keeps
+    no state between parse() calls, so every compiler can share one instance.
+    """
+    # Load grammar using importlib.resources for proper packaging
+    try:
+        grammar_file = files("stanzaflow.core") / "stz_grammar.lark"
+        grammar = grammar_file.read_text(encoding="utf-8")
+    except Exception:
+        # Fallback for development
+        grammar_path = Path(__file__).parent / "stz_grammar.lark"
+        with open(grammar_path, encoding="utf-8") as f:
+            grammar = f.read()
+
+    return Lark(grammar, start="start", parser="earley")
+
+
 class StanzaFlowCompiler:
     """Compiles .sf.md files to IR."""
 
     def __init__(self) -> None:
-        """Initialize compiler with Lark grammar."""
-        # Load grammar using importlib.resources for proper packaging
-        try:
-            grammar_file = files("stanzaflow.core") / "stz_grammar.lark"
-            grammar = grammar_file.read_text(encoding="utf-8")
-        except Exception:
-            # Fallback for development
-            grammar_path = Path(__file__).parent / "stz_grammar.lark"
-            with open(grammar_path, encoding="utf-8") as f:
-                grammar = f.read()
-
-        self.parser = Lark(grammar, start="start", parser="earley")
+        """Initialize compiler with the shared Lark parser."""
+        self.parser = _get_parser()
         self.transformer = StanzaFlowTransformer()
 
     def parse_file(self, file_path: Path) -> Workflow:
@@ -300,7 +324,7 @@ class StanzaFlowCompiler:
             for step in agent.steps:
                 step_ir = {"name": step.name, "attributes": {}}
 
-                for attr in step.attributes:
+                for attr in step.attributes.values():
                     step_ir["attributes"][attr.key] = attr.value
 
                 agent_ir["steps"].append(step_ir)
@@ -2,42 +2,49 @@
 
 from __future__ import annotations
 
-import json
 from importlib.resources import files as _files
 from pathlib import Path
-from typing import Any
-
-from jsonschema import Draft202012Validator, exceptions
+from typing import TYPE_CHECKING, Any
 
+from stanzaflow.core import _json
 from stanzaflow.core.exceptions import ValidationError
 
+if TYPE_CHECKING:
+    from jsonschema import Draft202012Validator
+
+# Repository-level copy of the schema, used when package data is unavailable
+_FALLBACK_SCHEMA_PATH = Path(__file__).resolve().parents[2] / "schemas" / "ir-0.2.json"
+
+# Built on first validation; importing jsonschema is deferred until then too
 _SCHEMA_CACHE: Draft202012Validator | None = None
 
 
+def _schema_bytes() -> bytes:
+    """Read the raw IR JSON schema from package data or the source tree."""
+    try:
+        # Use importlib.resources for proper package data access
+        return _files("stanzaflow.schemas").joinpath("ir-0.2.json").read_bytes()
+    except (ModuleNotFoundError, FileNotFoundError):
+        # Fallback for development/source installs
+        try:
+            return _FALLBACK_SCHEMA_PATH.read_bytes()
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                "Could not locate ir-0.2.json schema. "
+                "This indicates a packaging issue."
+            ) from None
+
+
 def _load_schema() -> Draft202012Validator:
     """Load and cache the IR JSON schema validator."""
     global _SCHEMA_CACHE
     if _SCHEMA_CACHE is None:
-        try:
-            # Use importlib.resources for proper package data access
-            schema_file = _files("stanzaflow.schemas").joinpath("ir-0.2.json")
-            with schema_file.open("r", encoding="utf-8") as fp:
-                schema = json.load(fp)
-        except (ModuleNotFoundError, FileNotFoundError):
-            # Fallback for development/source installs
-            fallback_path = (
-                Path(__file__).resolve().parent.parent.parent
-                / "schemas"
-                / "ir-0.2.json"
-            )
-            if not fallback_path.exists():
-                raise FileNotFoundError(
-                    "Could not locate ir-0.2.json schema. "
-                    "This indicates a packaging issue."
-                ) from None
-            with open(fallback_path, encoding="utf-8") as fp:
-                schema = json.load(fp)
+        from jsonschema import Draft202012Validator
 
+        schema = _json.loads(_schema_bytes())
+
+        # Fail fast on a broken bundled schema; costs one metaschema pass per process
+        Draft202012Validator.check_schema(schema)
         _SCHEMA_CACHE = Draft202012Validator(schema)
     return _SCHEMA_CACHE
 
@@ -48,6 +55,8 @@ def validate_ir(ir: dict[str, Any]) -> None:
     Raises:
         ValidationError: if IR does not conform, with user-friendly error message.
     """
+    from jsonschema import exceptions
+
     validator = _load_schema()
     try:
         validator.validate(ir)
@@ -0,0 +1,115 @@
+"""On-disk cache for compiled StanzaFlow IR."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from stanzaflow import __version__
+from stanzaflow.core import _json
+
+if TYPE_CHECKING:
+    from stanzaflow.core.ast import StanzaFlowCompiler
+
+#: Set to ``"0"`` to bypass the cache entirely
+CACHE_ENV_VAR = "STANZAFLOW_IR_CACHE"
+
+# Compiler inputs whose contents are folded into every cache key
+_CORE_DIR = Path(__file__).resolve().parent
+_COMPILER_SOURCES = ("stz_grammar.lark", "ast.py", "ir.py")
+
+
+def _cache_dir() -> Path:
+    """Return the directory holding cached IR files."""
+    import platformdirs
+
+    return Path(platformdirs.user_cache_dir("stanzaflow")) / "ir"
+
+
+@cache
+def _compiler_digest() -> bytes:
+    """Digest the compiler's own inputs, read once per process.
+
+    Editable installs keep ``__version__`` fixed while the grammar,
+    transformer or schema change, so the version alone cannot retire stale
+    entries.
+    """
+    from stanzaflow.core.ir import _schema_bytes
+
+    digest = hashlib.blake2b(digest_size=8)
+    for name in _COMPILER_SOURCES:
+        with contextlib.suppress(OSError):
+            digest.update((_CORE_DIR / name).read_bytes())
+        digest.update(b"\0")
+    with contextlib.suppress(OSError):
+        digest.update(_schema_bytes())
+    return digest.digest()
+
+
+def _cache_key(source: bytes) -> str:
+    """Key a source file on its contents and the compiler that builds it."""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(__version__.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(_compiler_digest())
+    digest.update(source)
+    return digest.hexdigest()
+
+
+def _compiler() -> StanzaFlowCompiler:
+    """Create a compiler; deferred so cache hits never load the grammar."""
+    from stanzaflow.core.ast import StanzaFlowCompiler
+
+    return StanzaFlowCompiler()
+
+
+def get_or_build_ir(path: Path) -> dict[str, Any]:
+    """Compile *path* to IR 0.2, reusing a cached result when available.
+
+    The cache is keyed on the file contents and the StanzaFlow version, so
+    edits to the workflow or an upgrade always trigger a fresh compile.
+
+    Args:
+        path: Path to the .sf.md file
+
+    Returns:
+        Validated IR dictionary
+
+    Raises:
+        ParseError: If the file cannot be read or parsed
+    """
+    if os.environ.get(CACHE_ENV_VAR, "1") == "0":
+        return _compiler().compile_file(path)
+
+    try:
+        source = path.read_bytes()
+        content = source.decode("utf-8")
+    except (OSError, UnicodeDecodeError):
+        # Let the compiler report unreadable files consistently
+        return _compiler().compile_file(path)
+
+    cache_file = _cache_dir() / f"{_cache_key(source)}.json"
+    try:
+        cached: dict[str, Any] = _json.loads(cache_file.read_bytes())
+        return cached
+    except (OSError, ValueError):
+        pass  # Cache miss or corrupt entry - rebuild below
+
+    ir = _compiler().compile_string(content, str(path))
+
+    # Write atomically so concurrent runs never observe a partial file
+    tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file.write_bytes(_json.dumps(ir))
+        tmp_file.replace(cache_file)
+    except (OSError, TypeError):
+        # Caching is best-effort; orjson rejects ints outside the 64-bit range
+        with contextlib.suppress(OSError):
+            tmp_file.unlink(missing_ok=True)
+
+    return ir
@@ -0,0 +1,44 @@
+"""Flat structure-of-arrays view of StanzaFlow IR."""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+
+class FlatWorkflow(NamedTuple):
+    """Column-oriented view of a workflow's agents, steps, and attributes.
+
+    Steps are stored in document order across all agents; attribute keys are
+    flattened across all steps in the same order.
+    """
+
+    agent_names: list[str]
+    step_names: list[str]
+    attr_keys: list[str]
+
+
+def flatten(ir: dict[str, Any]) -> FlatWorkflow:
+    """Build a :class:`FlatWorkflow` from nested IR in a single pass.
+
+    Missing names fall back to the same ``Agent{n}``/``Step{n}`` placeholders
+    used throughout the audit and emitter code.
+
+    Args:
+        ir: StanzaFlow IR dictionary
+
+    Returns:
+        Flattened workflow arrays
+    """
+    agent_names: list[str] = []
+    step_names: list[str] = []
+    attr_keys: list[str] = []
+
+    agents = ir.get("workflow", {}).get("agents", [])
+    for i, agent in enumerate(agents):
+        agent_names.append(agent.get("name", f"Agent{i+1}"))
+
+        for j, step in enumerate(agent.get("steps", [])):
+            step_names.append(step.get("name", f"Step{j+1}"))
+            attr_keys.extend(step.get("attributes", {}))
+
+    return FlatWorkflow(agent_names, step_names, attr_keys)
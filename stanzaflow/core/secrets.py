@@ -16,27 +16,25 @@ def resolve_secrets(ir: dict[str, Any]) -> dict[str, str]:
         Dictionary mapping env_var names to their resolved values
 
     Raises:
-        ValueError: If required environment variable is not set
+        ValueError: If any required environment variable is not set; the
+            message lists every missing variable, not just the first
     """
-    secrets = {}
-    workflow = ir.get("workflow", {})
-    secret_blocks = workflow.get("secrets", [])
-
-    for secret_block in secret_blocks:
-        env_var = secret_block.get("env_var")
-        if not env_var:
-            continue
-
-        value = os.environ.get(env_var)
-        if value is None:
-            raise ValueError(
-                f"Required environment variable '{env_var}' is not set. "
-                f"Please set it before compiling the workflow."
-            )
-
-        secrets[env_var] = value
-
-    return secrets
+    # Check everything up front so users can fix all missing vars in one go
+    missing = validate_secrets(ir)
+    if missing:
+        names = ", ".join(f"'{env_var}'" for env_var in missing)
+        raise ValueError(
+            f"Required environment variable(s) {names} not set. "
+            f"Please set them before compiling the workflow."
+        )
+
+    env = os.environ
+    secret_blocks = ir.get("workflow", {}).get("secrets", [])
+    return {
+        secret_block["env_var"]: env[secret_block["env_var"]]
+        for secret_block in secret_blocks
+        if secret_block.get("env_var")
+    }
 
 
 def validate_secrets(ir: dict[str, Any]) -> list[str]:
@@ -51,10 +49,11 @@ def validate_secrets(ir: dict[str, Any]) -> list[str]:
     missing = []
     workflow = ir.get("workflow", {})
     secret_blocks = workflow.get("secrets", [])
+    env = os.environ
 
     for secret_block in secret_blocks:
         env_var = secret_block.get("env_var")
-        if env_var and os.environ.get(env_var) is None:
+        if env_var and env.get(env_var) is None:
             missing.append(env_var)
 
     return missing
@@ -69,14 +68,9 @@ def mask_secret_value(value: str) -> str:
     Returns:
         Masked version showing only first 2 and last 2 characters for longer secrets
     """
-    if not value:
-        return "***"
-
-    # For very short secrets, mask completely to avoid revealing too much
-    if len(value) < 6:
-        return "***"
-
-    return f"{value[:2]}***{value[-2:]}"
+    # Empty and very short secrets are masked completely to avoid revealing
+    # too much; len() of "" is 0, so one comparison covers both cases
+    return "***" if len(value) < 6 else f"{value[:2]}***{value[-2:]}"
 
 
 def get_safe_secrets_summary(ir: dict[str, Any]) -> dict[str, str]:
@@ -91,13 +85,14 @@ def get_safe_secrets_summary(ir: dict[str, Any]) -> dict[str, str]:
     secrets = {}
     workflow = ir.get("workflow", {})
     secret_blocks = workflow.get("secrets", [])
+    env = os.environ
 
     for secret_block in secret_blocks:
         env_var = secret_block.get("env_var")
         if not env_var:
             continue
 
-        value = os.environ.get(env_var)
+        value = env.get(env_var)
         if value is None:
             secrets[env_var] = "NOT_SET"
         else:
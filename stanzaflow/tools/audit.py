@@ -1,6 +1,8 @@
 """Audit functionality for StanzaFlow workflows."""
 
 import tempfile
+from collections import Counter
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
@@ -8,6 +10,12 @@ from rich.console import Console
 
 console = Console()
 
+# Step attributes the LangGraph emitter implements natively
+_LANGGRAPH_SUPPORTED_ATTRS = frozenset({"artifact", "retry", "timeout"})
+
+# Step content keywords that suggest branching or parallel flow control
+_COMPLEX_FLOW_KEYWORDS = ("if", "condition", "branch", "parallel", "fork")
+
 
 def audit_workflow(
     ir: dict[str, Any], target: str = "langgraph", verbose: bool = False
@@ -65,32 +73,29 @@ def audit_workflow(
 
 def _collect_statistics(workflow: dict[str, Any], results: dict[str, Any]) -> None:
     """Collect workflow statistics for reporting."""
-    agents = workflow.get("agents", [])
+    from stanzaflow.core.ir_soa import flatten
+    from stanzaflow.core.secrets import get_safe_secrets_summary
+
     secrets = workflow.get("secrets", [])
     escape_blocks = workflow.get("escape_blocks", [])
 
-    total_steps = sum(len(agent.get("steps", [])) for agent in agents)
-
-    # Count step attributes
-    attribute_counts: dict[str, int] = {}
-    for agent in agents:
-        for step in agent.get("steps", []):
-            for attr in step.get("attributes", {}):
-                attribute_counts[attr] = attribute_counts.get(attr, 0) + 1
+    ir = {"workflow": workflow}
+    flat = flatten(ir)
+    agent_count = len(flat.agent_names)
+    total_steps = len(flat.step_names)
 
     # Get safe secrets summary (masked values)
-    from stanzaflow.core.secrets import get_safe_secrets_summary
-
-    ir = {"workflow": workflow}
     safe_secrets = get_safe_secrets_summary(ir)
 
     results["statistics"] = {
-        "agents": len(agents),
+        "agents": agent_count,
         "total_steps": total_steps,
         "secrets": len(secrets),
         "escape_blocks": len(escape_blocks),
-        "attribute_usage": attribute_counts,
-        "avg_steps_per_agent": round(total_steps / len(agents), 1) if agents else 0,
+        "attribute_usage": dict(Counter(flat.attr_keys)),
+        "avg_steps_per_agent": (
+            round(total_steps / agent_count, 1) if agent_count else 0
+        ),
         "secret_status": safe_secrets,  # Masked secret values for safe display
     }
 
@@ -155,7 +160,6 @@ def _check_workflow_structure(
         return
 
     # Check agent structure
-    seen_agents = set()
     for i, agent in enumerate(agents):
         agent_name = agent.get("name", f"Agent{i+1}")
 
@@ -178,22 +182,9 @@ def _check_workflow_structure(
                 }
             )
 
-        # Duplicate agent name detection
-        if agent_name in seen_agents:
-            results["issues"].append(
-                {
-                    "severity": "error",
-                    "message": f"Duplicate agent name '{agent_name}'",
-                    "details": "Agent names must be unique within a workflow",
-                }
-            )
-        seen_agents.add(agent_name)
-
         # Check step structure
-        seen_steps = set()
         for j, step in enumerate(steps):
-            step_name = step.get("name")
-            if not step_name:
+            if not step.get("name"):
                 results["issues"].append(
                     {
                         "severity": "warning",
@@ -201,16 +192,39 @@ def _check_workflow_structure(
                         "details": "Step names help with readability and debugging",
                     }
                 )
-            else:
-                if step_name in seen_steps:
-                    results["issues"].append(
-                        {
-                            "severity": "error",
-                            "message": f"Duplicate step name '{step_name}' in agent '{agent_name}'",
-                            "details": "Step names must be unique within an agent.",
-                        }
-                    )
-                seen_steps.add(step_name)
+
+        step_names = (step["name"] for step in steps if step.get("name"))
+        for step_name in _find_duplicates(step_names):
+            results["issues"].append(
+                {
+                    "severity": "error",
+                    "message": f"Duplicate step name '{step_name}' in agent '{agent_name}'",
+                    "details": "Step names must be unique within an agent.",
+                }
+            )
+
+    # Duplicate agent name detection
+    agent_names = (agent.get("name", f"Agent{i+1}") for i, agent in enumerate(agents))
+    for agent_name in _find_duplicates(agent_names):
+        results["issues"].append(
+            {
+                "severity": "error",
+                "message": f"Duplicate agent name '{agent_name}'",
+                "details": "Agent names must be unique within a workflow",
+            }
+        )
+
+
+def _find_duplicates(items: Iterable[str]) -> list[str]:
+    """Return every repeated occurrence in *items*, in order of appearance."""
+    seen: set[str] = set()
+    duplicates = []
+    for item in items:
+        if item in seen:
+            duplicates.append(item)
+        else:
+            seen.add(item)
+    return duplicates
 
 
 def _check_langgraph_compatibility(
@@ -230,10 +244,9 @@ def _check_langgraph_compatibility(
             attributes = step.get("attributes", {})
 
             # Check for unsupported step attributes in current implementation
-            unsupported_attrs = []
-            for attr in attributes:
-                if attr not in ["artifact", "retry", "timeout"]:
-                    unsupported_attrs.append(attr)
+            unsupported_attrs = [
+                attr for attr in attributes if attr not in _LANGGRAPH_SUPPORTED_ATTRS
+            ]
 
             if unsupported_attrs:
                 results["todos"].append(
@@ -259,12 +272,9 @@ def _check_unsupported_patterns(
         for agent in agents:
             steps = agent.get("steps", [])
             for step in steps:
-                content = step.get("content", "")
+                content = step.get("content", "").lower()
                 # Look for keywords that suggest complex flow control
-                if any(
-                    keyword in content.lower()
-                    for keyword in ["if", "condition", "branch", "parallel", "fork"]
-                ):
+                if any(keyword in content for keyword in _COMPLEX_FLOW_KEYWORDS):
                     has_complex_flow = True
                     break
             if has_complex_flow:
@@ -286,7 +296,6 @@ def _check_unsupported_patterns(
 
         for j, step in enumerate(steps):
             step_name = step.get("name", f"Step{j+1}")
-            content = step.get("content", "")
             attributes = step.get("attributes", {})
 
             # Check for complex attributes that aren't implemented
@@ -429,7 +438,6 @@ def _check_secrets_configuration(
     if not secrets:
         return
 
-    seen_vars = set()
     for secret in secrets:
         env_var = secret.get("env_var")
         if not env_var:
@@ -442,16 +450,6 @@ def _check_secrets_configuration(
             )
             continue
 
-        if env_var in seen_vars:
-            results["issues"].append(
-                {
-                    "severity": "warning",
-                    "message": f"Duplicate secret declaration for '{env_var}'",
-                    "details": "Environment variables should only be declared once",
-                }
-            )
-        seen_vars.add(env_var)
-
         # Check naming conventions
         if not env_var.isupper():
             results["recommendations"].append(
@@ -467,6 +465,16 @@ def _check_secrets_configuration(
                 }
             )
 
+    env_vars = (secret["env_var"] for secret in secrets if secret.get("env_var"))
+    for env_var in _find_duplicates(env_vars):
+        results["issues"].append(
+            {
+                "severity": "warning",
+                "message": f"Duplicate secret declaration for '{env_var}'",
+                "details": "Environment variables should only be declared once",
+            }
+        )
+
 
 def _generate_summary(results: dict[str, Any]) -> None:
     """Generate audit summary."""
@@ -475,8 +483,9 @@ def _generate_summary(results: dict[str, Any]) -> None:
     stats = results["statistics"]
 
     # Count by severity
-    error_count = sum(1 for issue in issues if issue.get("severity") == "error")
-    warning_count = sum(1 for issue in issues if issue.get("severity") == "warning")
+    severity_counts = Counter(issue.get("severity") for issue in issues)
+    error_count = severity_counts["error"]
+    warning_count = severity_counts["warning"]
 
     # Determine overall health
     if error_count > 0:
@@ -4,56 +4,96 @@ import hashlib
 import shutil
 import subprocess
 import tempfile
-import threading
+from collections.abc import Callable, Set
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from stanzaflow.console import console
 
-# Cache for tool availability checks
-_MERMAID_AVAILABLE: bool | None = None
-_GRAPHVIZ_AVAILABLE: bool | None = None
-# Lock to guard cache mutation in multithreaded contexts
-_CACHE_LOCK = threading.Lock()
+# Runs an external renderer command; same calling convention as subprocess.run
+Runner = Callable[..., "subprocess.CompletedProcess[Any]"]
+
+# Flag each renderer CLI accepts to print its version, in preference order
+_VERSION_FLAGS = {"mmdc": "--version", "dot": "-V"}
+# Renderer driven by each CLI
+_RENDERERS = {"mmdc": "mermaid", "dot": "graphviz"}
+
+
+def _default_cli_runner(
+    cmd: list[str], **kwargs: Any
+) -> "subprocess.CompletedProcess[Any]":
+    """Run *cmd* with :func:`subprocess.run`."""
+    return subprocess.run(cmd, **kwargs)
+
+
+@lru_cache(maxsize=8)
+def _detect_tool(name: str, runner: Runner = _default_cli_runner) -> str | None:
+    """Return the *name* CLI's version line, or None if it is not installed.
+
+    The CLI is probed once per process; results are cached per
+    ``(name, runner)`` pair so logging can reuse the version without running
+    the CLI again. Call :func:`_reset_tool_cache` to probe again.
+    """
+    if not shutil.which(name):
+        return None
+    try:
+        result = runner(
+            [name, _VERSION_FLAGS[name]],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+        )
+    except FileNotFoundError:
+        return None
+    if result.returncode != 0:
+        return None
+    # Graphviz -V writes to stderr, Mermaid CLI to stdout
+    version_info = (result.stdout or result.stderr or "").strip()
+    return version_info.split("\n")[0] if version_info else "unknown"
 
 
 def _reset_tool_cache() -> None:
     """Reset tool availability cache (for testing)."""
-    global _MERMAID_AVAILABLE, _GRAPHVIZ_AVAILABLE
-    _MERMAID_AVAILABLE = None
-    _GRAPHVIZ_AVAILABLE = None
+    _detect_tool.cache_clear()
+
+
+def _preferred_tool(
+    runner: Runner = _default_cli_runner, exclude: Set[str] = frozenset()
+) -> str | None:
+    """Return the first installed renderer CLI in preference order, if any.
+
+    Probing stops at the first tool found, so ``dot -V`` is never run when
+    Mermaid CLI is available. Tools in *exclude* are skipped, e.g. after
+    they failed to render.
+    """
+    for name in _VERSION_FLAGS:
+        if name not in exclude and _detect_tool(name, runner) is not None:
+            return name
+    return None
+
 
+def _select_renderer(tool: str | None) -> str:
+    """Map the preferred renderer CLI to its renderer; with none, use text."""
+    return _RENDERERS[tool] if tool else "text"
 
-def _log_renderer_status(renderer: str) -> None:
-    """Log which renderer was successfully used."""
+
+def _log_renderer_status(renderer: str, runner: Runner = _default_cli_runner) -> None:
+    """Log which renderer was successfully used, from the cached version probe."""
     if renderer == "mermaid":
-        try:
-            result = subprocess.run(
-                ["mmdc", "--version"], capture_output=True, text=True
-            )
-            version = (
-                result.stdout.strip().split("\n")[0]
-                if result.returncode == 0
-                else "unknown"
-            )
-            console.print(f"[dim][graph] using mermaid-cli {version}[/dim]")
-        except Exception:
-            console.print("[dim][graph] using mermaid-cli[/dim]")
+        console.print(
+            f"[dim][graph] using mermaid-cli {_detect_tool('mmdc', runner)}[/dim]"
+        )
     elif renderer == "graphviz":
-        try:
-            # Graphviz -V writes to stderr, so capture both streams
-            result = subprocess.run(["dot", "-V"], capture_output=True, text=True)
-            version_info = (
-                result.stderr.strip() if result.stderr else result.stdout.strip()
-            )
-            version_line = version_info.split("\n")[0] if version_info else "unknown"
-            console.print(f"[dim][graph] using {version_line}[/dim]")
-        except Exception:
-            console.print("[dim][graph] using graphviz[/dim]")
+        console.print(f"[dim][graph] using {_detect_tool('dot', runner)}[/dim]")
 
 
 def generate_workflow_graph(
-    ir: dict[str, Any], output_path: Path, out_fmt: str = "svg"
+    ir: dict[str, Any],
+    output_path: Path,
+    out_fmt: str = "svg",
+    *,
+    runner: Runner = _default_cli_runner,
 ) -> bool:
     """Generate a visual graph of the workflow.
 
@@ -61,6 +101,7 @@ def generate_workflow_graph(
         ir: StanzaFlow IR dictionary
         output_path: Path to save the graph
         out_fmt: Output format (svg, png, pdf)
+        runner: Executes mmdc/dot commands; defaults to subprocess.run
 
     Returns:
         bool: True if generated with preferred method, False if fallback used
@@ -68,19 +109,29 @@ def generate_workflow_graph(
     # Generate Mermaid diagram
     mermaid_content = _generate_mermaid_diagram(ir)
 
-    # Try Mermaid CLI first
-    if _try_mermaid_cli(mermaid_content, output_path, out_fmt):
-        _log_renderer_status("mermaid")
+    renderer = _select_renderer(_preferred_tool(runner))
+
+    if renderer == "mermaid":
+        if _try_mermaid_cli(mermaid_content, output_path, out_fmt, runner):
+            _log_renderer_status("mermaid", runner)
+            return True
+        # mmdc is installed but failed to render; Graphviz may still work
+        renderer = _select_renderer(_preferred_tool(runner, exclude={"mmdc"}))
+        console.print(
+            "[yellow]Mermaid CLI rendering failed, falling back to Graphviz...[/yellow]"
+        )
+    else:
+        console.print(
+            "[yellow]Mermaid CLI not available, falling back to Graphviz...[/yellow]"
+        )
+
+    if renderer == "graphviz" and _try_graphviz_fallback(
+        ir, output_path, out_fmt, runner
+    ):
+        _log_renderer_status("graphviz", runner)
         return True
 
-    # Fall back to Graphviz
-    console.print(
-        "[yellow]Mermaid CLI not available, falling back to Graphviz...[/yellow]"
-    )
-    success = _try_graphviz_fallback(ir, output_path, out_fmt)
-    if success:
-        _log_renderer_status("graphviz")
-    return success
+    return _write_text_fallback(ir, output_path)
 
 
 def _generate_mermaid_diagram(ir: dict[str, Any]) -> str:
@@ -89,6 +140,13 @@ def _generate_mermaid_diagram(ir: dict[str, Any]) -> str:
     title = workflow.get("title", "Untitled Workflow")
     agents = workflow.get("agents", [])
 
+    if not agents:
+        # Nothing to traverse: emit the fixed START --> END diagram directly
+        return (
+            f"graph TD\n    %% {title}\n\n"
+            "    START([Start])\n    END([End])\n    START --> END"
+        )
+
     lines = [
         "graph TD",
         f"    %% {title}",
@@ -98,15 +156,6 @@ def _generate_mermaid_diagram(ir: dict[str, Any]) -> str:
     # Add start node
     lines.append("    START([Start])")
 
-    if not agents:
-        lines.extend(
-            [
-                "    END([End])",
-                "    START --> END",
-            ]
-        )
-        return "\n".join(lines)
-
     # Generate nodes for each agent
     prev_node = "START"
     for i, agent in enumerate(agents):
@@ -166,30 +215,15 @@ def _generate_mermaid_diagram(ir: dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-def _try_mermaid_cli(mermaid_content: str, output_path: Path, out_fmt: str) -> bool:
+def _try_mermaid_cli(
+    mermaid_content: str,
+    output_path: Path,
+    out_fmt: str,
+    runner: Runner = _default_cli_runner,
+) -> bool:
     """Try to render using Mermaid CLI."""
-    global _MERMAID_AVAILABLE
-
     try:
-        # Check if mmdc is available (cached) - protect both read and write
-        with _CACHE_LOCK:
-            if _MERMAID_AVAILABLE is None:
-                mmdc_path = shutil.which("mmdc")
-                if not mmdc_path:
-                    _MERMAID_AVAILABLE = False
-                else:
-                    try:
-                        subprocess.run(
-                            ["mmdc", "--version"], capture_output=True, check=True
-                        )
-                        _MERMAID_AVAILABLE = True
-                    except (subprocess.CalledProcessError, FileNotFoundError):
-                        _MERMAID_AVAILABLE = False
-
-            # Read the cached value while still holding the lock
-            mermaid_available = _MERMAID_AVAILABLE
-
-        if not mermaid_available:
+        if _detect_tool("mmdc", runner) is None:
             return False
 
         # Use temporary directory for better cleanup
@@ -213,14 +247,19 @@ def _try_mermaid_cli(mermaid_content: str, output_path: Path, out_fmt: str) -> b
             if out_fmt != "svg":
                 cmd.extend(["-f", out_fmt])
 
-            subprocess.run(cmd, check=True, capture_output=True)
-            return True
+            result = runner(cmd, capture_output=True)
+            return result.returncode == 0
 
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    except FileNotFoundError:
         return False
 
 
-def _try_graphviz_fallback(ir: dict[str, Any], output_path: Path, out_fmt: str) -> bool:
+def _try_graphviz_fallback(
+    ir: dict[str, Any],
+    output_path: Path,
+    out_fmt: str,
+    runner: Runner = _default_cli_runner,
+) -> bool:
     """Fall back to Graphviz rendering."""
     try:
         # Try to use the diagrams library first
@@ -233,7 +272,7 @@ def _try_graphviz_fallback(ir: dict[str, Any], output_path: Path, out_fmt: str)
         pass  # diagrams library failed
 
     # Fall back to raw Graphviz
-    return _try_raw_graphviz(ir, output_path, out_fmt)
+    return _try_raw_graphviz(ir, output_path, out_fmt, runner)
 
 
 def _try_diagrams_library(ir: dict[str, Any], output_path: Path, out_fmt: str) -> bool:
@@ -274,7 +313,12 @@ def _try_diagrams_library(ir: dict[str, Any], output_path: Path, out_fmt: str) -
         return False
 
 
-def _try_raw_graphviz(ir: dict[str, Any], output_path: Path, out_fmt: str) -> bool:
+def _try_raw_graphviz(
+    ir: dict[str, Any],
+    output_path: Path,
+    out_fmt: str,
+    runner: Runner = _default_cli_runner,
+) -> bool:
     """Fall back to raw Graphviz DOT format."""
     try:
         workflow = ir.get("workflow", {})
@@ -321,69 +365,57 @@ def _try_raw_graphviz(ir: dict[str, Any], output_path: Path, out_fmt: str) -> bo
         dot_content = "\n".join(dot_lines)
 
         # Try to render with dot command
-        global _GRAPHVIZ_AVAILABLE
-        try:
-            # Check if dot is available (cached) - protect both read and write
-            with _CACHE_LOCK:
-                if _GRAPHVIZ_AVAILABLE is None:
-                    dot_path = shutil.which("dot")
-                    if not dot_path:
-                        _GRAPHVIZ_AVAILABLE = False
-                    else:
-                        try:
-                            subprocess.run(
-                                ["dot", "-V"], capture_output=True, check=True
-                            )
-                            _GRAPHVIZ_AVAILABLE = True
-                        except (subprocess.CalledProcessError, FileNotFoundError):
-                            _GRAPHVIZ_AVAILABLE = False
-
-                # Read the cached value while still holding the lock
-                graphviz_available = _GRAPHVIZ_AVAILABLE
-
-            if not graphviz_available:
-                # No Graphviz CLI available, fall through to text fallback
-                raise subprocess.CalledProcessError(1, ["dot"])
-
-            with tempfile.TemporaryDirectory() as temp_dir:
-                tmp_path = Path(temp_dir) / "workflow.dot"
-                tmp_path.write_text(dot_content, encoding="utf-8")
-
-                cmd = ["dot", f"-T{out_fmt}", str(tmp_path), "-o", str(output_path)]
-                subprocess.run(cmd, check=True, capture_output=True)
-                return True
+        if _detect_tool("dot", runner) is None:
+            return False
 
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            # No Graphviz CLI, save as text but preserve original path for user feedback
-            text_output_path = output_path.with_suffix(".txt")
-
-            with open(text_output_path, "w") as f:
-                f.write("# Workflow Graph (Text Fallback)\n\n")
-                f.write(f"## {title}\n\n")
-
-                if not agents:
-                    f.write("Start → End\n")
-                else:
-                    f.write("Start")
-                    for agent in agents:
-                        agent_name = agent.get("name", "Agent")
-                        f.write(f" → {agent_name}")
-                    f.write(" → End\n")
-
-                # Add the Mermaid source for reference
-                f.write("\n\n## Mermaid Source\n\n")
-                f.write("```mermaid\n")
-                mermaid_content = _generate_mermaid_diagram(ir)
-                f.write(mermaid_content)
-                f.write("\n```\n")
-
-            console.print(
-                f"[yellow]Graphviz not available or rendering failed—saved text representation to: {text_output_path}[/yellow]"
-            )
-            console.print(
-                "💡 Install Mermaid CLI (mmdc) or Graphviz for full SVG/PNG rendering capabilities."
-            )
-            return True
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tmp_path = Path(temp_dir) / "workflow.dot"
+            tmp_path.write_text(dot_content, encoding="utf-8")
+
+            cmd = ["dot", f"-T{out_fmt}", str(tmp_path), "-o", str(output_path)]
+            return runner(cmd, capture_output=True).returncode == 0
+
+    except Exception:
+        return False
+
+
+def _write_text_fallback(ir: dict[str, Any], output_path: Path) -> bool:
+    """Save a text representation when no renderer produced *output_path*."""
+    try:
+        workflow = ir.get("workflow", {})
+        title = workflow.get("title", "Untitled Workflow")
+        agents = workflow.get("agents", [])
+
+        # Preserve the original path's stem for user feedback
+        text_output_path = output_path.with_suffix(".txt")
+
+        with open(text_output_path, "w") as f:
+            f.write("# Workflow Graph (Text Fallback)\n\n")
+            f.write(f"## {title}\n\n")
+
+            if not agents:
+                f.write("Start → End\n")
+            else:
+                f.write("Start")
+                for agent in agents:
+                    agent_name = agent.get("name", "Agent")
+                    f.write(f" → {agent_name}")
+                f.write(" → End\n")
+
+            # Add the Mermaid source for reference
+            f.write("\n\n## Mermaid Source\n\n")
+            f.write("```mermaid\n")
+            mermaid_content = _generate_mermaid_diagram(ir)
+            f.write(mermaid_content)
+            f.write("\n```\n")
+
+        console.print(
+            f"[yellow]Graphviz not available or rendering failed—saved text representation to: {text_output_path}[/yellow]"
+        )
+        console.print(
+            "💡 Install Mermaid CLI (mmdc) or Graphviz for full SVG/PNG rendering capabilities."
+        )
+        return True
 
     except Exception:
         return False
@@ -391,5 +423,5 @@ def _try_raw_graphviz(ir: dict[str, Any], output_path: Path, out_fmt: str) -> bo
 
 # Helper to create stable node IDs avoiding collisions
 def _stable_id(prefix: str, name: str) -> str:
-    digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:8]
+    digest = hashlib.blake2b(name.encode("utf-8"), digest_size=4).hexdigest()
     return f"{prefix}_{digest}"
@@ -0,0 +1,117 @@
+"""Shared pytest configuration for the StanzaFlow test suite."""
+
+import json
+from functools import cache
+from pathlib import Path
+
+import pytest
+
+from stanzaflow.tools.graph import _reset_tool_cache
+
+
+def _fail_if_called(*args, **kwargs):
+    """Guard ``subprocess.run`` while ``shutil.which`` reports no renderers."""
+    raise AssertionError("subprocess.run should not be called when no CLI is available")
+
+
+def _stub_emit(self, ir, output_path):
+    """Write a fixed, TODO-free module in place of real LangGraph output."""
+    Path(output_path).write_text("# stub\n")
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _isolated_ir_cache(tmp_path_factory):
+    """Keep the on-disk IR cache out of the user's cache directory."""
+    cache_dir = tmp_path_factory.mktemp("ir-cache")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("stanzaflow.core.ir_cache._cache_dir", lambda: cache_dir)
+        yield cache_dir
+
+
+@pytest.fixture(scope="session")
+def graph_tmp(tmp_path_factory):
+    """Single output directory for graph rendering tests.
+
+    Tests name their outputs after ``request.node.name`` so they never collide.
+    """
+    return tmp_path_factory.mktemp("graphs")
+
+
+@pytest.fixture
+def graph_tool_isolation(monkeypatch):
+    """Start a test with an empty tool cache and no mmdc/dot on PATH.
+
+    With no renderer on PATH the graph code must never shell out, so
+    ``subprocess.run`` fails the test if it is reached. ``stanzaflow.tools.graph``
+    shares the global ``shutil``/``subprocess`` modules, so this is opted into
+    per module with ``usefixtures`` rather than patched suite-wide. Tests that
+    need a renderer patch ``shutil.which`` and pass a fake runner instead.
+    """
+    _reset_tool_cache()
+    monkeypatch.setattr("stanzaflow.tools.graph.shutil.which", lambda tool: None)
+    monkeypatch.setattr("stanzaflow.tools.graph.subprocess.run", _fail_if_called)
+
+
+@pytest.fixture
+def stub_emitter(request, monkeypatch):
+    """Replace ``LangGraphEmitter.emit`` with a stub for audit-only tests.
+
+    Opted into per module with ``usefixtures`` since the adapter and CLI tests
+    exercise real emission. Tests marked ``real_emit`` keep the real emitter;
+    they must call ``audit_workflow`` directly rather than the cached ``audit``
+    fixture, whose results are computed against the stub.
+    """
+    if "real_emit" in request.keywords:
+        return
+    monkeypatch.setattr(
+        "stanzaflow.adapters.langgraph.emit.LangGraphEmitter.emit", _stub_emit
+    )
+
+
+@pytest.fixture(scope="session")
+def branch_workflow(tmp_path_factory):
+    """Workflow using ``branch:``, which LangGraph cannot lower natively."""
+    path = tmp_path_factory.mktemp("sf") / "complex.sf.md"
+    path.write_text("""# Complex Workflow
+
+## Agent: TestAgent
+- Step: TestStep
+  branch: some_condition
+""")
+    return path
+
+
+@pytest.fixture(scope="session")
+def simple_workflow(tmp_path_factory):
+    """Workflow using only attributes LangGraph supports."""
+    path = tmp_path_factory.mktemp("sf") / "simple.sf.md"
+    path.write_text("""# Simple Workflow
+
+## Agent: TestAgent
+- Step: TestStep
+  artifact: output.txt
+  retry: 3
+""")
+    return path
+
+
+@cache
+def _cached_audit(ir_json, target, verbose):
+    from stanzaflow.tools.audit import audit_workflow
+
+    return audit_workflow(json.loads(ir_json), target, verbose)
+
+
+@pytest.fixture(scope="session")
+def audit():
+    """Run ``audit_workflow``, reusing results for identical IR within a session.
+
+    IR is keyed by its canonical JSON form. Results are shared between tests,
+    so treat them as read-only, and call ``audit_workflow`` directly when the
+    outcome depends on patches or environment variables.
+    """
+
+    def _audit(ir, target="langgraph", verbose=False):
+        return _cached_audit(json.dumps(ir, sort_keys=True), target, verbose)
+
+    return _audit
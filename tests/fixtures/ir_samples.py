@@ -0,0 +1,120 @@
+"""Read-only IR samples shared across test modules.
+
+Dicts are wrapped in ``MappingProxyType`` and lists become tuples, so any
+code path that mutates its input fails loudly with ``TypeError``. Only use
+these with read-only consumers (audit, adapters, graph generation); JSON
+Schema validation requires real dicts and lists.
+"""
+
+from types import MappingProxyType
+from typing import Any
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts and lists to immutable equivalents."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+IR_MINIMAL = _freeze(
+    {
+        "ir_version": "0.2",
+        "workflow": {
+            "title": "UnitTest Flow",
+            "agents": [
+                {
+                    "name": "Bot",
+                    "steps": [{"name": "Hello", "attributes": {"artifact": "out.txt"}}],
+                }
+            ],
+        },
+    }
+)
+
+IR_BASIC = _freeze(
+    {
+        "ir_version": "0.2",
+        "workflow": {
+            "title": "Test Workflow",
+            "agents": [
+                {
+                    "name": "TestAgent",
+                    "steps": [
+                        {"name": "TestStep", "attributes": {"artifact": "test.txt"}}
+                    ],
+                }
+            ],
+            "secrets": [],
+            "escape_blocks": [],
+        },
+    }
+)
+
+IR_COMPLEX = _freeze(
+    {
+        "ir_version": "0.2",
+        "workflow": {
+            "title": "Complex Workflow",
+            "agents": [
+                {
+                    "name": "Agent1",
+                    "steps": [
+                        {
+                            "name": "Step1",
+                            "attributes": {"artifact": "out1.txt", "retry": 3},
+                        },
+                        {
+                            "name": "Step2",
+                            "attributes": {"timeout": 30, "branch": "condition"},
+                        },
+                    ],
+                },
+                {
+                    "name": "Agent2",
+                    "steps": [
+                        {
+                            "name": "Step3",
+                            "attributes": {"artifact": "out2.txt"},
+                        }
+                    ],
+                },
+            ],
+            "secrets": [
+                {"env_var": "API_KEY"},
+                {"env_var": "SECRET_TOKEN"},
+            ],
+            "escape_blocks": [{"target": "langgraph", "code": "custom_logic()"}],
+        },
+    }
+)
+
+IR_WITH_ISSUES = _freeze(
+    {
+        "ir_version": "0.2",
+        "workflow": {
+            "title": "",  # Missing title
+            "agents": [
+                {
+                    "name": "Agent1",
+                    "steps": [
+                        {"name": "Step1", "attributes": {}},
+                        {"name": "Step1", "attributes": {}},  # Duplicate step name
+                    ],
+                },
+                {
+                    "name": "Agent1",  # Duplicate agent name
+                    "steps": [],  # No steps
+                },
+            ],
+            "secrets": [
+                {"env_var": "api_key"},  # Lowercase (should recommend uppercase)
+                {"env_var": "API_KEY"},
+                {"env_var": "API_KEY"},  # Duplicate
+            ],
+            "escape_blocks": [],
+        },
+    }
+)
@@ -6,20 +6,7 @@ import pytest
 
 from stanzaflow.adapters import get_adapter
 from stanzaflow.core.exceptions import UnknownAdapterError
-
-# Minimal IR for tests
-IR_MINIMAL = {
-    "ir_version": "0.2",
-    "workflow": {
-        "title": "UnitTest Flow",
-        "agents": [
-            {
-                "name": "Bot",
-                "steps": [{"name": "Hello", "attributes": {"artifact": "out.txt"}}],
-            }
-        ],
-    },
-}
+from tests.fixtures.ir_samples import IR_MINIMAL
 
 
 def test_get_adapter_langgraph():
@@ -30,6 +17,11 @@ def test_get_adapter_langgraph():
     assert isinstance(adapter, LangGraphAdapter)
 
 
+def test_get_adapter_returns_shared_instance():
+    """Repeated lookups reuse the same stateless adapter."""
+    assert get_adapter("langgraph") is get_adapter("langgraph")
+
+
 def test_langgraph_emit(tmp_path: Path):
     """LangGraph adapter emits valid Python file."""
     adapter = get_adapter("langgraph")
@@ -1,5 +1,7 @@
 """Tests for AI escape functionality."""
 
+import re
+
 import pytest
 
 from stanzaflow.core.ai_escape import (
@@ -11,6 +13,9 @@ from stanzaflow.core.ai_escape import (
     validate_generated_code,
 )
 
+# Escape hashes are SHA-256 digests truncated to 16 lowercase hex chars
+HEX16 = re.compile(r"[0-9a-f]{16}")
+
 
 class TestAIEscape:
     """Test AI escape functionality."""
@@ -54,6 +59,25 @@ class TestAIEscape:
         assert "Original request: langgraph" in escape_block["code"]
         assert "print('hello')" in escape_block["code"]
 
+    def test_process_ai_escapes_multiple_blocks_keep_order(self):
+        """Test that concurrently processed blocks stay matched to their source."""
+        ir = {
+            "ir_version": "0.2",
+            "workflow": {
+                "title": "Test",
+                "agents": [],
+                "escape_blocks": [
+                    {"target": f"target{i}", "code": f"print({i})"} for i in range(5)
+                ],
+            },
+        }
+
+        result = process_ai_escapes(ir, "gpt-4")
+
+        for i, escape_block in enumerate(result["workflow"]["escape_blocks"]):
+            assert f"Original request: target{i}" in escape_block["code"]
+            assert f"print({i})" in escape_block["code"]
+
     def test_create_escape_hash(self):
         """Test escape hash creation."""
         escape_block1 = {"target": "langgraph", "code": "Some AI escape content"}
@@ -71,8 +95,7 @@ class TestAIEscape:
         assert hash1 != hash3
 
         # Hash should be reasonable length (SHA-256 truncated to 16 hex chars)
-        assert len(hash1) == 16
-        assert all(c in "0123456789abcdef" for c in hash1)
+        assert HEX16.fullmatch(hash1)
 
     def test_validate_generated_code_valid(self):
         """Test validating valid Python code."""
@@ -97,6 +120,14 @@ def hello(
         except AIEscapeError as e:
             assert "syntax errors" in str(e)
 
+    def test_validate_generated_code_requires_langgraph_import(self):
+        """Test that LangGraph targets must import a langgraph module."""
+        with pytest.raises(AIEscapeError, match="must import langgraph"):
+            validate_generated_code("import json\n", "langgraph")
+
+        assert validate_generated_code("import langgraph.graph\n", "langgraph")
+        assert validate_generated_code("import json\n", "other") is True
+
     def test_escape_hash_consistency(self):
         """Test that escape hashes are consistent across calls."""
         escape_block = {
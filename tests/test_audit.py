@@ -1,6 +1,16 @@
 """Tests for audit functionality."""
 
-from stanzaflow.tools.audit import audit_workflow
+import pytest
+
+from stanzaflow.tools.audit import _find_duplicates, audit_workflow
+from tests.fixtures.ir_samples import IR_BASIC, IR_COMPLEX, IR_WITH_ISSUES
+
+pytestmark = pytest.mark.usefixtures("stub_emitter")
+
+
+def _issue_text(results):
+    """Join all issue messages into one lowercase blob for substring checks."""
+    return "\n".join(issue.get("message", "") for issue in results["issues"]).lower()
 
 
 class TestAuditTool:
@@ -8,24 +18,7 @@ class TestAuditTool:
 
     def test_audit_basic_workflow(self):
         """Test auditing a basic workflow."""
-        ir = {
-            "ir_version": "0.2",
-            "workflow": {
-                "title": "Test Workflow",
-                "agents": [
-                    {
-                        "name": "TestAgent",
-                        "steps": [
-                            {"name": "TestStep", "attributes": {"artifact": "test.txt"}}
-                        ],
-                    }
-                ],
-                "secrets": [],
-                "escape_blocks": [],
-            },
-        }
-
-        results = audit_workflow(ir, "langgraph", verbose=True)
+        results = audit_workflow(IR_BASIC, "langgraph", verbose=True)
 
         # Should have statistics
         assert "statistics" in results
@@ -52,43 +45,7 @@ class TestAuditTool:
 
     def test_audit_complex_workflow(self):
         """Test auditing a complex workflow."""
-        ir = {
-            "ir_version": "0.2",
-            "workflow": {
-                "title": "Complex Workflow",
-                "agents": [
-                    {
-                        "name": "Agent1",
-                        "steps": [
-                            {
-                                "name": "Step1",
-                                "attributes": {"artifact": "out1.txt", "retry": 3},
-                            },
-                            {
-                                "name": "Step2",
-                                "attributes": {"timeout": 30, "branch": "condition"},
-                            },
-                        ],
-                    },
-                    {
-                        "name": "Agent2",
-                        "steps": [
-                            {
-                                "name": "Step3",
-                                "attributes": {"artifact": "out2.txt"},
-                            }
-                        ],
-                    },
-                ],
-                "secrets": [
-                    {"env_var": "API_KEY"},
-                    {"env_var": "SECRET_TOKEN"},
-                ],
-                "escape_blocks": [{"target": "langgraph", "code": "custom_logic()"}],
-            },
-        }
-
-        results = audit_workflow(ir, "langgraph", verbose=True)
+        results = audit_workflow(IR_COMPLEX, "langgraph", verbose=True)
 
         # Check statistics
         stats = results["statistics"]
@@ -106,73 +63,28 @@ class TestAuditTool:
         assert attr_usage["branch"] == 1
 
         # Should have capability gap for branching
-        issues = results["issues"]
-        has_branching_issue = any(
-            "branch" in issue.get("message", "").lower() for issue in issues
-        )
-        assert has_branching_issue
+        assert "branch" in _issue_text(results)
 
     def test_audit_workflow_with_issues(self):
         """Test auditing a workflow with various issues."""
-        ir = {
-            "ir_version": "0.2",
-            "workflow": {
-                "title": "",  # Missing title
-                "agents": [
-                    {
-                        "name": "Agent1",
-                        "steps": [
-                            {"name": "Step1", "attributes": {}},
-                            {"name": "Step1", "attributes": {}},  # Duplicate step name
-                        ],
-                    },
-                    {
-                        "name": "Agent1",  # Duplicate agent name
-                        "steps": [],  # No steps
-                    },
-                ],
-                "secrets": [
-                    {"env_var": "api_key"},  # Lowercase (should recommend uppercase)
-                    {"env_var": "API_KEY"},
-                    {"env_var": "API_KEY"},  # Duplicate
-                ],
-                "escape_blocks": [],
-            },
-        }
+        results = audit_workflow(IR_WITH_ISSUES, "langgraph", verbose=True)
 
-        results = audit_workflow(ir, "langgraph", verbose=True)
-
-        issues = results["issues"]
+        issue_text = _issue_text(results)
 
         # Should detect missing title
-        has_title_issue = any(
-            "title" in issue.get("message", "").lower() for issue in issues
-        )
-        assert has_title_issue
+        assert "title" in issue_text
 
         # Should detect duplicate agent name
-        has_duplicate_agent = any(
-            "duplicate agent" in issue.get("message", "").lower() for issue in issues
-        )
-        assert has_duplicate_agent
+        assert "duplicate agent" in issue_text
 
         # Should detect duplicate step name
-        has_duplicate_step = any(
-            "duplicate step" in issue.get("message", "").lower() for issue in issues
-        )
-        assert has_duplicate_step
+        assert "duplicate step" in issue_text
 
         # Should detect empty agent
-        has_empty_agent = any(
-            "no steps" in issue.get("message", "").lower() for issue in issues
-        )
-        assert has_empty_agent
+        assert "no steps" in issue_text
 
         # Should detect duplicate secret
-        has_duplicate_secret = any(
-            "duplicate secret" in issue.get("message", "").lower() for issue in issues
-        )
-        assert has_duplicate_secret
+        assert "duplicate secret" in issue_text
 
         # Should recommend uppercase for env var
         recommendations = results["recommendations"]
@@ -205,27 +117,17 @@ class TestAuditTool:
 
         results = audit_workflow(ir, "langgraph", verbose=True)
 
-        issues = results["issues"]
+        issue_text = _issue_text(results)
         recommendations = results["recommendations"]
 
         # Should find issues with invalid characters
-        has_invalid_chars = any(
-            "special characters" in issue.get("message", "") for issue in issues
-        )
-        assert has_invalid_chars
+        assert "special characters" in issue_text
 
         # Should find duplicate secret
-        has_duplicate = any(
-            "duplicate secret" in issue.get("message", "").lower() for issue in issues
-        )
-        assert has_duplicate
+        assert "duplicate secret" in issue_text
 
         # Should find missing env_var
-        has_missing_var = any(
-            "missing environment variable" in issue.get("message", "").lower()
-            for issue in issues
-        )
-        assert has_missing_var
+        assert "missing environment variable" in issue_text
 
         # Should recommend uppercase
         has_uppercase_rec = any("uppercase" in rec.lower() for rec in recommendations)
@@ -327,3 +229,9 @@ class TestAuditTool:
 
         results = audit_workflow(poor_ir, "langgraph")
         assert results["summary"]["health"] == "poor"
+
+
+def test_find_duplicates_reports_each_repeat():
+    """Every occurrence after the first is reported, in order."""
+    assert _find_duplicates(["a", "b", "a", "c", "b", "a"]) == ["a", "b", "a"]
+    assert _find_duplicates(["a", "b"]) == []
@@ -2,12 +2,17 @@
 
 from pathlib import Path
 
+import pytest
 from typer.testing import CliRunner
 
 from stanzaflow.cli.main import app
 
 runner = CliRunner()
 
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+SIMPLE_WORKFLOW = FIXTURE_DIR / "simple_workflow_no_attrs.sf.md"
+MISSING_SECRET_WORKFLOW = FIXTURE_DIR / "missing_secret.sf.md"
+
 
 def test_version():
     """Test version command."""
@@ -23,26 +28,26 @@ def test_graph_missing_file():
     assert "does not exist" in result.stdout
 
 
+@pytest.mark.slow
 def test_graph_existing_file():
     """Test graph command with existing file."""
-    fixture_path = Path(__file__).parent / "fixtures" / "simple_workflow_no_attrs.sf.md"
-    result = runner.invoke(app, ["graph", str(fixture_path)])
+    result = runner.invoke(app, ["graph", str(SIMPLE_WORKFLOW)])
     assert result.exit_code == 0
     assert "Generating graph" in result.stdout
 
 
+@pytest.mark.slow
 def test_compile_existing_file():
     """Test compile command with existing file."""
-    fixture_path = Path(__file__).parent / "fixtures" / "simple_workflow_no_attrs.sf.md"
-    result = runner.invoke(app, ["compile", str(fixture_path)])
+    result = runner.invoke(app, ["compile", str(SIMPLE_WORKFLOW)])
     assert result.exit_code == 0
     assert "Compiling" in result.stdout
 
 
+@pytest.mark.slow
 def test_audit_existing_file():
     """Test audit command with existing file."""
-    fixture_path = Path(__file__).parent / "fixtures" / "simple_workflow_no_attrs.sf.md"
-    result = runner.invoke(app, ["audit", str(fixture_path)])
+    result = runner.invoke(app, ["audit", str(SIMPLE_WORKFLOW)])
     assert result.exit_code == 0
     assert "Auditing" in result.stdout
 
@@ -57,21 +62,11 @@ def test_init_creates_file(tmp_path):
     assert "Workflow:" in content and "Agent:" in content
 
 
-def test_compile_capability_gaps_without_escapes(tmp_path):
+@pytest.mark.slow
+def test_compile_capability_gaps_without_escapes(branch_workflow):
     """Test that compile fails when capability gaps exist and AI escapes are disabled."""
-    # Create a workflow with unsupported features
-    workflow_content = """# Complex Workflow
-
-## Agent: TestAgent
-- Step: TestStep
-  branch: some_condition
-"""
-
-    workflow_file = tmp_path / "complex.sf.md"
-    workflow_file.write_text(workflow_content)
-
     result = runner.invoke(
-        app, ["compile", str(workflow_file), "--target", "langgraph"]
+        app, ["compile", str(branch_workflow), "--target", "langgraph"]
     )
 
     # Should fail with exit code 2 (configuration error)
@@ -80,21 +75,11 @@ def test_compile_capability_gaps_without_escapes(tmp_path):
     assert "branch" in result.stdout
 
 
-def test_compile_capability_gaps_with_escapes(tmp_path):
+@pytest.mark.slow
+def test_compile_capability_gaps_with_escapes(branch_workflow):
     """Test that compile succeeds when capability gaps exist but AI escapes are enabled."""
-    # Create a workflow with unsupported features
-    workflow_content = """# Complex Workflow
-
-## Agent: TestAgent
-- Step: TestStep
-  branch: some_condition
-"""
-
-    workflow_file = tmp_path / "complex.sf.md"
-    workflow_file.write_text(workflow_content)
-
     result = runner.invoke(
-        app, ["compile", str(workflow_file), "--target", "langgraph", "--ai-escapes"]
+        app, ["compile", str(branch_workflow), "--target", "langgraph", "--ai-escapes"]
     )
 
     # Should succeed but show AI escapes are enabled
@@ -102,25 +87,27 @@ def test_compile_capability_gaps_with_escapes(tmp_path):
     assert "Processing AI escapes" in result.stdout
 
 
-def test_compile_no_capability_gaps(tmp_path):
+@pytest.mark.slow
+def test_compile_no_capability_gaps(simple_workflow):
     """Test that compile succeeds when no capability gaps exist."""
-    # Create a simple workflow that LangGraph supports
-    workflow_content = """# Simple Workflow
-
-## Agent: TestAgent
-- Step: TestStep
-  artifact: output.txt
-  retry: 3
-"""
-
-    workflow_file = tmp_path / "simple.sf.md"
-    workflow_file.write_text(workflow_content)
-
     result = runner.invoke(
-        app, ["compile", str(workflow_file), "--target", "langgraph"]
+        app, ["compile", str(simple_workflow), "--target", "langgraph"]
     )
 
     # Should succeed without any capability warnings
     assert result.exit_code == 0
     assert "Successfully compiled" in result.stdout
     assert "does not support" not in result.stdout
+
+
+@pytest.mark.slow
+def test_compile_missing_secret(monkeypatch, tmp_path):
+    """Test compile exits with a configuration error when a secret is unset."""
+    monkeypatch.delenv("STANZAFLOW_TEST_MISSING_SECRET", raising=False)
+
+    result = runner.invoke(
+        app, ["compile", str(MISSING_SECRET_WORKFLOW), "--outdir", str(tmp_path)]
+    )
+
+    assert result.exit_code == 2
+    assert "STANZAFLOW_TEST_MISSING_SECRET" in result.stdout
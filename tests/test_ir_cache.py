@@ -0,0 +1,122 @@
+"""Tests for the on-disk IR cache."""
+
+from pathlib import Path
+
+import pytest
+
+from stanzaflow.core.ast import StanzaFlowCompiler
+from stanzaflow.core.exceptions import ParseError
+from stanzaflow.core.ir_cache import CACHE_ENV_VAR, get_or_build_ir
+
+FIXTURE = Path(__file__).parent / "fixtures" / "simple_workflow_no_attrs.sf.md"
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the IR cache at a fresh directory."""
+    directory = tmp_path / "cache"
+    monkeypatch.setattr("stanzaflow.core.ir_cache._cache_dir", lambda: directory)
+    return directory
+
+
+@pytest.fixture
+def compile_calls(monkeypatch):
+    """Count how often the compiler actually runs."""
+    calls = []
+    original = StanzaFlowCompiler.compile_string
+
+    def counting_compile(self, content, source="<string>"):
+        calls.append(source)
+        return original(self, content, source)
+
+    monkeypatch.setattr(StanzaFlowCompiler, "compile_string", counting_compile)
+    return calls
+
+
+def test_cache_hit_skips_compile(cache_dir, compile_calls):
+    """Second lookup of unchanged source is served from disk."""
+    first = get_or_build_ir(FIXTURE)
+    second = get_or_build_ir(FIXTURE)
+
+    assert first == second
+    assert first == StanzaFlowCompiler().compile_file(FIXTURE)
+    assert len(compile_calls) == 1
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+
+def test_cache_hit_skips_parser(cache_dir, monkeypatch):
+    """A cache hit never builds the Lark parser."""
+    get_or_build_ir(FIXTURE)
+
+    def no_parser():
+        raise AssertionError("parser built on a cache hit")
+
+    monkeypatch.setattr("stanzaflow.core.ast._get_parser", no_parser)
+
+    assert get_or_build_ir(FIXTURE)["ir_version"] == "0.2"
+
+
+def test_cache_invalidated_on_change(cache_dir, compile_calls, tmp_path):
+    """Editing the source produces a new cache entry."""
+    workflow = tmp_path / "flow.sf.md"
+    workflow.write_text("# First\n\n## Agent: Bot\n- Step: Hello\n")
+    assert get_or_build_ir(workflow)["workflow"]["title"] == "First"
+
+    workflow.write_text("# Second\n\n## Agent: Bot\n- Step: Hello\n")
+    assert get_or_build_ir(workflow)["workflow"]["title"] == "Second"
+
+    assert len(compile_calls) == 2
+    assert len(list(cache_dir.glob("*.json"))) == 2
+
+
+def test_cache_invalidated_on_compiler_change(cache_dir, compile_calls, monkeypatch):
+    """Changing the grammar, transformer or schema retires old entries."""
+    get_or_build_ir(FIXTURE)
+    monkeypatch.setattr(
+        "stanzaflow.core.ir_cache._compiler_digest", lambda: b"edited grammar"
+    )
+
+    get_or_build_ir(FIXTURE)
+
+    assert len(compile_calls) == 2
+    assert len(list(cache_dir.glob("*.json"))) == 2
+
+
+def test_corrupt_cache_entry_is_rebuilt(cache_dir, compile_calls):
+    """A damaged cache file is ignored and overwritten."""
+    get_or_build_ir(FIXTURE)
+    (cache_file,) = cache_dir.glob("*.json")
+    cache_file.write_text("{not json")
+
+    ir = get_or_build_ir(FIXTURE)
+
+    assert ir["ir_version"] == "0.2"
+    assert len(compile_calls) == 2
+
+
+def test_unserializable_ir_skips_cache(cache_dir, tmp_path):
+    """IR the JSON backend cannot encode is returned uncached."""
+    big = 2**64 + 1
+    workflow = tmp_path / "big.sf.md"
+    workflow.write_text(f"# Big\n\n## Agent: Bot\n- Step: Hello\n  retry: {big}\n")
+
+    ir = get_or_build_ir(workflow)
+
+    step = ir["workflow"]["agents"][0]["steps"][0]
+    assert step["attributes"]["retry"] == big
+    assert not list(cache_dir.glob("*.tmp"))
+
+
+def test_cache_disabled_by_env(cache_dir, compile_calls, monkeypatch):
+    """Setting the escape hatch bypasses the cache."""
+    monkeypatch.setenv(CACHE_ENV_VAR, "0")
+
+    get_or_build_ir(FIXTURE)
+
+    assert not cache_dir.exists()
+
+
+def test_missing_file_raises_parse_error(cache_dir):
+    """Unreadable files surface the compiler's ParseError."""
+    with pytest.raises(ParseError):
+        get_or_build_ir(Path("nonexistent.sf.md"))
@@ -0,0 +1,48 @@
+"""Tests for the structure-of-arrays IR view."""
+
+from stanzaflow.core.ir_soa import flatten
+
+
+def test_flatten_preserves_document_order():
+    """Agents, steps, and attributes are flattened in order."""
+    ir = {
+        "ir_version": "0.2",
+        "workflow": {
+            "title": "Flat",
+            "agents": [
+                {
+                    "name": "Bot",
+                    "steps": [
+                        {"name": "Hello", "attributes": {"artifact": "a.txt"}},
+                        {"name": "Wave", "attributes": {"retry": 2, "timeout": 5}},
+                    ],
+                },
+                {"name": "Human", "steps": [{"name": "Review", "attributes": {}}]},
+            ],
+        },
+    }
+
+    flat = flatten(ir)
+
+    assert flat.agent_names == ["Bot", "Human"]
+    assert flat.step_names == ["Hello", "Wave", "Review"]
+    assert flat.attr_keys == ["artifact", "retry", "timeout"]
+
+
+def test_flatten_fills_placeholder_names():
+    """Missing names fall back to positional placeholders."""
+    ir = {"workflow": {"agents": [{"steps": [{}, {"name": "Named"}]}, {}]}}
+
+    flat = flatten(ir)
+
+    assert flat.agent_names == ["Agent1", "Agent2"]
+    assert flat.step_names == ["Step1", "Named"]
+    assert flat.attr_keys == []
+
+
+def test_flatten_empty_ir():
+    """An IR without a workflow flattens to empty arrays."""
+    flat = flatten({})
+
+    assert flat.agent_names == []
+    assert flat.step_names == []
@@ -0,0 +1,45 @@
+"""Tests for the JSON helpers."""
+
+import pytest
+
+from stanzaflow.core import _json
+
+SAMPLE = {
+    "workflow": {"title": "Café", "agents": [{"name": "Bot", "steps": []}]},
+    "ir_version": "0.2",
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test against orjson (when installed) and the stdlib fallback."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(_json, "_HAS_ORJSON", False)
+    return request.param
+
+
+def test_dumps_is_compact_and_sorted(backend):
+    """Output uses sorted keys, no whitespace, and raw UTF-8."""
+    assert (
+        _json.dumps(SAMPLE)
+        == (
+            '{"ir_version":"0.2","workflow":{"agents":[{"name":"Bot","steps":[]}],'
+            '"title":"Café"}}'
+        ).encode()
+    )
+
+
+def test_round_trip(backend):
+    """loads accepts both bytes and str."""
+    data = _json.dumps(SAMPLE)
+
+    assert _json.loads(data) == SAMPLE
+    assert _json.loads(data.decode("utf-8")) == SAMPLE
+
+
+def test_loads_invalid_raises_value_error(backend):
+    """Malformed input raises a ValueError subclass on every backend."""
+    with pytest.raises(ValueError):
+        _json.loads(b"{not json")
@@ -1,10 +1,10 @@
 """Test parser and compiler functionality."""
 
-import json
 from pathlib import Path
 
 import pytest
 
+from stanzaflow.core import _json
 from stanzaflow.core.ast import StanzaFlowCompiler
 from stanzaflow.core.exceptions import ParseError
 
@@ -101,8 +101,7 @@ class TestStanzaFlowCompiler:
         compiled_ir = self.compiler.compile_file(fixture_path)
 
         # Load golden IR
-        with open(golden_path) as f:
-            golden_ir = json.load(f)
+        golden_ir = _json.loads(golden_path.read_bytes())
 
         # Compare
         assert compiled_ir == golden_ir
@@ -164,6 +163,10 @@ graph.add_node("custom", custom_function)
         with pytest.raises(ParseError):
             self.compiler.parse_string("Invalid syntax ###")
 
+    def test_compilers_share_parser(self):
+        """Test that the Lark grammar is only built once per process."""
+        assert StanzaFlowCompiler().parser is self.compiler.parser
+
     def test_missing_file_error(self):
         """Test missing file error."""
         with pytest.raises(ParseError):
@@ -192,3 +195,20 @@ graph.add_node("custom", custom_function)
         assert step.get_attribute("on_error").value == "handle_error"
         assert step.get_attribute("branch").value == "conditional_path"
         assert step.get_attribute("finally").value == "cleanup_step"
+
+    def test_step_attributes_skip_invalid(self):
+        """Test that unknown keys and non-integer counts are dropped."""
+        content = """# Test Workflow
+
+## Agent: Bot
+- Step: Loose step
+  retry: often
+  colour: blue
+  artifact: out.txt
+"""
+        workflow = self.compiler.parse_string(content)
+        step = workflow.agents[0].steps[0]
+
+        assert step.get_attribute("retry") is None
+        assert step.get_attribute("colour") is None
+        assert step.get_attribute("artifact").value == "out.txt"
@@ -1,8 +1,6 @@
 """Tests for secrets handling."""
 
 import os
-import tempfile
-from pathlib import Path
 from unittest.mock import patch
 
 import pytest
@@ -90,6 +88,30 @@ class TestSecretsHandling:
             with pytest.raises(ValueError, match="MISSING_SECRET"):
                 resolve_secrets(ir)
 
+    def test_resolve_secrets_reports_all_missing(self):
+        """Test that every missing variable is named in a single error."""
+        ir = {
+            "ir_version": "0.2",
+            "workflow": {
+                "title": "Test",
+                "agents": [],
+                "secrets": [
+                    {"env_var": "FIRST_MISSING"},
+                    {"env_var": "PRESENT_SECRET"},
+                    {"env_var": "SECOND_MISSING"},
+                ],
+            },
+        }
+
+        with patch.dict(os.environ, {"PRESENT_SECRET": "value"}, clear=True):
+            with pytest.raises(ValueError) as exc_info:
+                resolve_secrets(ir)
+
+        message = str(exc_info.value)
+        assert "FIRST_MISSING" in message
+        assert "SECOND_MISSING" in message
+        assert "PRESENT_SECRET" not in message
+
     def test_validate_secrets_success(self):
         """Test secret validation with all secrets present."""
         ir = {
@@ -177,9 +199,8 @@ class TestSecretsHandling:
         """Test that CLI validates secrets before compilation."""
         import typer
 
-        from stanzaflow.cli.main import compile as cli_compile
+        from stanzaflow.cli.main import _assert_secrets_available
 
-        # Create a temporary workflow file with secrets
         content = """# Test Workflow
 
 !env MISSING_SECRET
@@ -187,28 +208,13 @@ class TestSecretsHandling:
 ## Agent: Bot
 - Step: Test
 """
+        ir = self.compiler.compile_string(content)
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sf.md", delete=False) as f:
-            f.write(content)
-            f.flush()
-            workflow_path = Path(f.name)
-
-        try:
-            with patch.dict(os.environ, {}, clear=True):
-                with pytest.raises(typer.Exit) as exc_info:
-                    cli_compile(
-                        file=workflow_path,
-                        target="langgraph",
-                        output=None,
-                        outdir=None,
-                        overwrite=False,
-                        ai_escapes=False,
-                        model="gpt-4",
-                    )
-                # Should exit with code 2 for configuration errors
-                assert exc_info.value.exit_code == 2
-        finally:
-            workflow_path.unlink()
+        with patch.dict(os.environ, {}, clear=True):
+            with pytest.raises(typer.Exit) as exc_info:
+                _assert_secrets_available(ir)
+        # Should exit with code 2 for configuration errors
+        assert exc_info.value.exit_code == 2
 
     def test_end_to_end_with_secrets(self):
         """Test end-to-end compilation with secrets."""